@@ -129,6 +129,7 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Update profile with avatar handling."""
         avatar_id = validated_data.pop('avatar_id', None)
+        changed_fields = []
         
         # Handle avatar update
         if avatar_id is not None:
@@ -141,12 +142,18 @@ class UserProfileUpdateSerializer(serializers.ModelSerializer):
                     raise serializers.ValidationError({'avatar_id': 'Invalid avatar ID'})
             else:
                 instance.avatar = None
+            changed_fields.append('avatar')
         
-        # Update other fields
+        # Update other fields, remembering which ones actually changed
         for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+            if getattr(instance, attr) != value:
+                setattr(instance, attr, value)
+                changed_fields.append(attr)
         
-        instance.save()
+        # Only write the changed columns, and skip the UPDATE entirely
+        # when the request didn't change anything
+        if changed_fields:
+            instance.save(update_fields=changed_fields + ['updated_at'])
         return instance
 
 
@@ -228,6 +235,6 @@ class AvatarUploadSerializer(serializers.Serializer):
         # Assign to user profile
         profile = self.context['request'].user.profile
         profile.avatar = image
-        profile.save()
+        profile.save(update_fields=['avatar', 'updated_at'])
         
         return image
@@ -178,6 +178,7 @@ def user_profile_stats(request):
         'emergency_contact_phone', 'emergency_contact_relationship'
     ]
     
+    active_groups = [membership.group.name for membership in group_memberships]
     completed_fields = sum(1 for field in profile_fields if getattr(profile, field))
     total_fields = len(profile_fields)
     completion_percentage = (completed_fields / total_fields) * 100
@@ -186,8 +187,8 @@ def user_profile_stats(request):
         'profile_completion_percentage': round(completion_percentage, 2),
         'completed_fields': completed_fields,
         'total_fields': total_fields,
-        'group_memberships_count': group_memberships.count(),
-        'active_groups': [membership.group.name for membership in group_memberships],
+        'group_memberships_count': len(active_groups),
+        'active_groups': active_groups,
         'profile_created_at': profile.created_at,
         'profile_updated_at': profile.updated_at,
         'user_joined_at': user.date_joined,
@@ -369,7 +370,7 @@ class AvatarDeleteView(APIView):
         
         # Delete the avatar
         profile.avatar = None
-        profile.save()
+        profile.save(update_fields=['avatar', 'updated_at'])
         
         return Response({
             'detail': 'Avatar deleted successfully',
@@ -388,9 +389,9 @@ def avatar_info(request):
     Get current user's avatar information.
     GET /api/user-profile/avatar/info/
     """
-    profile = request.user.profile
+    profile = UserProfile.lite_for(request.user.id)
     
-    if not profile.avatar:
+    if profile.avatar_id is None:
         return Response({
             'has_avatar': False,
             'avatar': None
@@ -449,7 +450,7 @@ def set_avatar_from_existing(request):
     # Set the avatar
     profile = request.user.profile
     profile.avatar = image
-    profile.save()
+    profile.save(update_fields=['avatar', 'updated_at'])
     
     # Return updated profile
     profile_serializer = UserProfileSerializer(profile)
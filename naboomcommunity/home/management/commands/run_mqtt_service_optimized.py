@@ -1,30 +1,95 @@
 """Django management command to run optimized MQTT service for HTTP/3 architecture."""
 import asyncio
+import functools
 import json
 import logging
+import multiprocessing
 import signal
 import ssl
 import sys
 import time
-from typing import Any, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Optional, Dict, Union
 from urllib.parse import urlparse
 
 import aiomqtt
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - fall back to the default asyncio loop
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+# Broker-side group used to load-balance messages across worker processes
+SHARED_SUBSCRIPTION_GROUP = 'naboom-workers'
+
+# Payloads at or above this size are parsed off the event loop
+LARGE_PAYLOAD_BYTES = 16384
+
+# orjson parses several times faster than json and emits bytes, which aiomqtt
+# publishes as-is; its JSONDecodeError subclasses json.JSONDecodeError
+decode_json = orjson.loads if orjson is not None else json.loads
+encode_json = orjson.dumps if orjson is not None else json.dumps
+
 
 class OptimizedMQTTService:
     """Optimized MQTT service for HTTP/3 architecture with WebSocket support."""
     
-    def __init__(self):
+    def __init__(self, worker_id: Optional[int] = None, shared_subscription: bool = False,
+                 use_ssl: Optional[bool] = None):
         self.client: Optional[aiomqtt.Client] = None
         self.running = True
+        self.worker_id = worker_id
+        self.shared_subscription = shared_subscription
+        self._cfg = self._load_config(use_ssl)
+        # Loading the trust store is expensive; share one context across reconnects
+        self._ssl_context = self.create_ssl_context()
         self.connection_retries = 0
         self.max_retries = 5
         self.retry_delay = 5
+        self.max_retry_delay = 60
+        self.queue_size = 2048  # Bound memory held by messages awaiting dispatch
+        self.worker_count = 8
+        
+        # Static dispatch tables, built once rather than per message
+        self._category_handlers = {
+            'community': self.handle_community_message,
+            'system': self.handle_system_message,
+            'notifications': self.handle_notification_message,
+            'alerts': self.handle_alert_message,
+            'health': self.handle_health_message,
+        }
+        self._community_handlers = {
+            "post": self.handle_new_post,
+            "comment": self.handle_new_comment,
+            "user_join": self.handle_user_join,
+            "user_leave": self.handle_user_leave,
+            "update": self.handle_community_update,
+        }
+        self._system_handlers = {
+            "status": self.handle_system_status,
+            "health_check": self.handle_health_check,
+            "metrics": self.handle_system_metrics,
+        }
+        self._alert_handlers = {
+            "panic": self.handle_panic_alert,
+            "emergency": self.handle_emergency_alert,
+            "community": self.handle_community_alert,
+        }
+        
+        # Topics repeat heavily, so memoize topic -> handler resolution.
+        # The bound keeps memory flat for per-user notification topics.
+        self._resolve_topic = functools.lru_cache(maxsize=4096)(self._parse_topic)
+        
         self.setup_signal_handlers()
         
     def setup_signal_handlers(self):
@@ -34,13 +99,35 @@ class OptimizedMQTTService:
         
     def signal_handler(self, signum, frame):
         """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
+        logger.info("Received signal %s, shutting down gracefully...", signum)
         self.running = False
         sys.exit(0)
     
+    def _load_config(self, use_ssl: Optional[bool] = None) -> SimpleNamespace:
+        """Resolve MQTT settings once so reconnects don't re-read them."""
+        if use_ssl is None:
+            use_ssl = getattr(settings, 'MQTT_USE_SSL', False)
+        client_id = getattr(settings, 'MQTT_CLIENT_ID', 'naboom-community')
+        if self.worker_id is not None:
+            # Each worker process needs its own session on the broker
+            client_id = f"{client_id}-{self.worker_id}"
+        
+        return SimpleNamespace(
+            use_ssl=use_ssl,
+            host=getattr(settings, 'MQTT_HOST', 'localhost'),
+            port=getattr(settings, 'MQTT_SSL_PORT' if use_ssl else 'MQTT_PORT', 1883),
+            username=getattr(settings, 'MQTT_USERNAME', 'naboom-mqtt'),
+            password=getattr(settings, 'MQTT_PASSWORD', 'NaboomMQTT2024!'),
+            client_id=client_id,
+            keepalive=getattr(settings, 'MQTT_KEEPALIVE', 30),
+            max_queued=getattr(settings, 'MQTT_MAX_QUEUED_INCOMING_MESSAGES', 10_000),
+            max_inflight=getattr(settings, 'MQTT_MAX_INFLIGHT_MESSAGES', 1000),
+            max_outgoing=getattr(settings, 'MQTT_MAX_CONCURRENT_OUTGOING_CALLS', 1000),
+        )
+    
     def create_ssl_context(self) -> Optional[ssl.SSLContext]:
         """Create SSL context for secure MQTT connections."""
-        if not getattr(settings, 'MQTT_USE_SSL', False):
+        if not self._cfg.use_ssl:
             return None
             
         try:
@@ -53,31 +140,30 @@ class OptimizedMQTTService:
             
             return ssl_context
         except Exception as e:
-            logger.error(f"Failed to create SSL context: {e}")
+            logger.error("Failed to create SSL context: %s", e)
             return None
     
     def get_mqtt_client(self, use_websocket: bool = False) -> aiomqtt.Client:
         """Create and configure MQTT client optimized for HTTP/3 architecture."""
-        # Get MQTT settings from Django settings
-        mqtt_host = getattr(settings, 'MQTT_HOST', 'localhost')
-        mqtt_port = getattr(settings, 'MQTT_SSL_PORT' if getattr(settings, 'MQTT_USE_SSL', False) else 'MQTT_PORT', 1883)
-        mqtt_username = getattr(settings, 'MQTT_USERNAME', 'naboom-mqtt')
-        mqtt_password = getattr(settings, 'MQTT_PASSWORD', 'NaboomMQTT2024!')
-        mqtt_client_id = getattr(settings, 'MQTT_CLIENT_ID', 'naboom-community')
-        mqtt_keepalive = getattr(settings, 'MQTT_KEEPALIVE', 60)
-        
-        # Create SSL context if needed
-        tls_context = self.create_ssl_context()
+        cfg = self._cfg
         
         # Configure client for HTTP/3 optimization
         client_kwargs = {
-            'hostname': mqtt_host,
-            'port': mqtt_port,
-            'username': mqtt_username,
-            'password': mqtt_password,
-            'identifier': mqtt_client_id,
-            'keepalive': mqtt_keepalive,
-            'tls_context': tls_context,
+            'hostname': cfg.host,
+            'port': cfg.port,
+            'username': cfg.username,
+            'password': cfg.password,
+            'identifier': cfg.client_id,
+            'keepalive': cfg.keepalive,
+            'tls_context': self._ssl_context,
+            # Persistent session: the broker keeps our subscriptions and queued
+            # QoS 1 messages across reconnects
+            'clean_session': False,
+            # Absorb bursts instead of discarding messages when the queue fills,
+            # and let QoS 1 pipeline rather than wait on each PUBACK
+            'max_queued_incoming_messages': cfg.max_queued,
+            'max_inflight_messages': cfg.max_inflight,
+            'max_concurrent_outgoing_calls': cfg.max_outgoing,
         }
         
         # Add WebSocket support if requested
@@ -110,46 +196,63 @@ class OptimizedMQTTService:
             "naboom/health/+",  # Health monitoring
         ]
         
-        for topic in topics:
-            await client.subscribe(topic, qos=1)  # Use QoS 1 for reliability
-            logger.info(f"Subscribed to topic: {topic}")
+        # Let the broker round-robin messages across worker processes
+        if self.shared_subscription:
+            topics = [f"$share/{SHARED_SUBSCRIPTION_GROUP}/{topic}" for topic in topics]
+        
+        # One SUBSCRIBE packet carrying every filter, QoS 1 for reliability
+        await client.subscribe([(topic, 1) for topic in topics])
+        logger.info("Subscribed to topics: %s", ', '.join(topics))
     
     async def on_disconnect(self, client: aiomqtt.Client):
         """Callback for when the client disconnects from the broker."""
         logger.info("Disconnected from MQTT broker")
     
+    def _parse_topic(self, topic: str):
+        """Resolve a topic to (category, category handler, trailing segments)."""
+        # Parse topic structure: naboom/{category}/{subcategory}/{action}
+        # (the trailing action segment is optional for non-community topics)
+        topic_parts = topic.split('/', 3)
+        if len(topic_parts) < 3:
+            return None, None, ()
+        category = topic_parts[1]
+        return category, self._category_handlers.get(category), tuple(topic_parts[2:])
+    
+    async def _parse_payload(self, payload: bytes) -> dict:
+        """Decode a JSON payload, moving large ones to the thread pool."""
+        if not payload:
+            return {}
+        if len(payload) < LARGE_PAYLOAD_BYTES:
+            return decode_json(payload)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, decode_json, payload)
+    
     async def handle_message(self, message: aiomqtt.Message):
         """Handle incoming MQTT messages with HTTP/3 optimization."""
         try:
-            topic = str(message.topic)
-            payload = message.payload.decode('utf-8') if message.payload else ""
+            topic = message.topic.value
+            if not topic.startswith('naboom/'):
+                return
+            # Keep the raw bytes: decode_json parses them directly, so only
+            # decode when the payload is actually being logged
+            payload = message.payload or b""
             
-            logger.info(f"Received message on topic '{topic}': {payload}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Received message on topic '%s': %s",
+                    topic, payload.decode('utf-8', 'replace'),
+                )
             
-            # Parse topic structure: naboom/{category}/{subcategory}/{action}
-            topic_parts = topic.split('/')
-            if len(topic_parts) >= 4 and topic_parts[0] == 'naboom':
-                category = topic_parts[1]
-                
-                # Route to specific handlers based on category
-                handler_map = {
-                    'community': self.handle_community_message,
-                    'system': self.handle_system_message,
-                    'notifications': self.handle_notification_message,
-                    'alerts': self.handle_alert_message,
-                    'health': self.handle_health_message,
-                }
-                
-                handler = handler_map.get(category)
-                if handler:
-                    await handler(topic_parts[2:], payload)
-                else:
-                    logger.warning(f"Unknown message category: {category}")
+            category, handler, topic_args = self._resolve_topic(topic)
+            if handler:
+                await handler(topic_args, payload)
+            elif category:
+                logger.warning("Unknown message category: %s", category)
                     
         except Exception as e:
-            logger.error(f"Error processing MQTT message: {e}")
+            logger.error("Error processing MQTT message: %s", e)
     
-    async def handle_community_message(self, topic_parts: list, payload: str):
+    async def handle_community_message(self, topic_parts: tuple, payload: bytes):
         """Handle community-related MQTT messages."""
         try:
             if len(topic_parts) < 2:
@@ -157,156 +260,136 @@ class OptimizedMQTTService:
                 
             channel_id = topic_parts[0]
             action = topic_parts[1]
-            data = json.loads(payload) if payload else {}
+            data = await self._parse_payload(payload)
             
-            logger.info(f"Community message - Channel: {channel_id}, Action: {action}, Data: {data}")
+            logger.debug("Community message - Channel: %s, Action: %s, Data: %s", channel_id, action, data)
             
             # Route to specific handlers based on action
-            handler_map = {
-                "post": self.handle_new_post,
-                "comment": self.handle_new_comment,
-                "user_join": self.handle_user_join,
-                "user_leave": self.handle_user_leave,
-                "update": self.handle_community_update,
-            }
-            
-            handler = handler_map.get(action)
+            handler = self._community_handlers.get(action)
             if handler:
                 await handler(channel_id, data)
             else:
-                logger.warning(f"Unknown community action: {action}")
+                logger.warning("Unknown community action: %s", action)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in community message: {payload}")
+            logger.error("Invalid JSON in community message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling community message: {e}")
+            logger.error("Error handling community message: %s", e)
     
-    async def handle_system_message(self, topic_parts: list, payload: str):
+    async def handle_system_message(self, topic_parts: tuple, payload: bytes):
         """Handle system-related MQTT messages."""
         try:
             if len(topic_parts) < 1:
                 return
                 
             action = topic_parts[0]
-            data = json.loads(payload) if payload else {}
-            
-            logger.info(f"System message - Action: {action}, Data: {data}")
+            data = await self._parse_payload(payload)
             
-            handler_map = {
-                "status": self.handle_system_status,
-                "health_check": self.handle_health_check,
-                "metrics": self.handle_system_metrics,
-            }
+            logger.debug("System message - Action: %s, Data: %s", action, data)
             
-            handler = handler_map.get(action)
+            handler = self._system_handlers.get(action)
             if handler:
                 await handler(data)
             else:
-                logger.warning(f"Unknown system action: {action}")
+                logger.warning("Unknown system action: %s", action)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in system message: {payload}")
+            logger.error("Invalid JSON in system message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling system message: {e}")
+            logger.error("Error handling system message: %s", e)
     
-    async def handle_notification_message(self, topic_parts: list, payload: str):
+    async def handle_notification_message(self, topic_parts: tuple, payload: bytes):
         """Handle notification-related MQTT messages."""
         try:
             if len(topic_parts) < 1:
                 return
                 
             user_id = topic_parts[0]
-            data = json.loads(payload) if payload else {}
+            data = await self._parse_payload(payload)
             
-            logger.info(f"Notification message - User: {user_id}, Data: {data}")
+            logger.debug("Notification message - User: %s, Data: %s", user_id, data)
             await self.send_user_notification(user_id, data)
             
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in notification message: {payload}")
+            logger.error("Invalid JSON in notification message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling notification message: {e}")
+            logger.error("Error handling notification message: %s", e)
     
-    async def handle_alert_message(self, topic_parts: list, payload: str):
+    async def handle_alert_message(self, topic_parts: tuple, payload: bytes):
         """Handle emergency alert MQTT messages."""
         try:
             if len(topic_parts) < 1:
                 return
                 
             alert_type = topic_parts[0]
-            data = json.loads(payload) if payload else {}
+            data = await self._parse_payload(payload)
             
-            logger.info(f"Alert message - Type: {alert_type}, Data: {data}")
+            logger.debug("Alert message - Type: %s, Data: %s", alert_type, data)
             
             # Route to specific alert handlers
-            handler_map = {
-                "panic": self.handle_panic_alert,
-                "emergency": self.handle_emergency_alert,
-                "community": self.handle_community_alert,
-            }
-            
-            handler = handler_map.get(alert_type)
+            handler = self._alert_handlers.get(alert_type)
             if handler:
                 await handler(data)
             else:
-                logger.warning(f"Unknown alert type: {alert_type}")
+                logger.warning("Unknown alert type: %s", alert_type)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in alert message: {payload}")
+            logger.error("Invalid JSON in alert message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling alert message: {e}")
+            logger.error("Error handling alert message: %s", e)
     
-    async def handle_health_message(self, topic_parts: list, payload: str):
+    async def handle_health_message(self, topic_parts: tuple, payload: bytes):
         """Handle health monitoring MQTT messages."""
         try:
             if len(topic_parts) < 1:
                 return
                 
             service = topic_parts[0]
-            data = json.loads(payload) if payload else {}
+            data = await self._parse_payload(payload)
             
-            logger.info(f"Health message - Service: {service}, Data: {data}")
+            logger.debug("Health message - Service: %s, Data: %s", service, data)
             await self.handle_service_health(service, data)
             
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in health message: {payload}")
+            logger.error("Invalid JSON in health message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling health message: {e}")
+            logger.error("Error handling health message: %s", e)
     
     # Community message handlers
     async def handle_new_post(self, channel_id: str, data: dict):
         """Handle new post notifications."""
-        logger.info(f"New post in channel {channel_id}: {data}")
+        logger.debug("New post in channel %s: %s", channel_id, data)
         # Add your post handling logic here
         
     async def handle_new_comment(self, channel_id: str, data: dict):
         """Handle new comment notifications."""
-        logger.info(f"New comment in channel {channel_id}: {data}")
+        logger.debug("New comment in channel %s: %s", channel_id, data)
         # Add your comment handling logic here
         
     async def handle_user_join(self, channel_id: str, data: dict):
         """Handle user join notifications."""
-        logger.info(f"User joined channel {channel_id}: {data}")
+        logger.debug("User joined channel %s: %s", channel_id, data)
         # Add your user join logic here
         
     async def handle_user_leave(self, channel_id: str, data: dict):
         """Handle user leave notifications."""
-        logger.info(f"User left channel {channel_id}: {data}")
+        logger.debug("User left channel %s: %s", channel_id, data)
         # Add your user leave logic here
         
     async def handle_community_update(self, channel_id: str, data: dict):
         """Handle community update notifications."""
-        logger.info(f"Community update in channel {channel_id}: {data}")
+        logger.debug("Community update in channel %s: %s", channel_id, data)
         # Add your community update logic here
     
     # System message handlers
     async def handle_system_status(self, data: dict):
         """Handle system status updates."""
-        logger.info(f"System status update: {data}")
+        logger.debug("System status update: %s", data)
         # Add your system status logic here
         
     async def handle_health_check(self, data: dict):
         """Handle health check requests."""
-        logger.info(f"Health check request: {data}")
+        logger.debug("Health check request: %s", data)
         # Publish health status
         health_data = {
             "status": "healthy",
@@ -326,56 +409,68 @@ class OptimizedMQTTService:
                 "multiplexing": True
             }
         }
-        await self.publish_message("naboom/system/health", json.dumps(health_data))
+        await self.publish_message("naboom/system/health", encode_json(health_data))
         
     async def handle_system_metrics(self, data: dict):
         """Handle system metrics updates."""
-        logger.info(f"System metrics update: {data}")
+        logger.debug("System metrics update: %s", data)
         # Add your metrics handling logic here
     
     # Notification handlers
     async def send_user_notification(self, user_id: str, data: dict):
         """Send notification to specific user."""
-        logger.info(f"Sending notification to user {user_id}: {data}")
+        logger.debug("Sending notification to user %s: %s", user_id, data)
         # Add your notification logic here
     
     # Alert handlers
     async def handle_panic_alert(self, data: dict):
         """Handle panic alert messages."""
-        logger.info(f"Panic alert received: {data}")
+        logger.info("Panic alert received: %s", data)
         # Add your panic alert logic here
         
     async def handle_emergency_alert(self, data: dict):
         """Handle emergency alert messages."""
-        logger.info(f"Emergency alert received: {data}")
+        logger.info("Emergency alert received: %s", data)
         # Add your emergency alert logic here
         
     async def handle_community_alert(self, data: dict):
         """Handle community alert messages."""
-        logger.info(f"Community alert received: {data}")
+        logger.debug("Community alert received: %s", data)
         # Add your community alert logic here
     
     # Health handlers
     async def handle_service_health(self, service: str, data: dict):
         """Handle service health monitoring."""
-        logger.info(f"Service health - {service}: {data}")
+        logger.debug("Service health - %s: %s", service, data)
         # Add your service health monitoring logic here
     
-    async def publish_message(self, topic: str, payload: str, qos: int = 1, retain: bool = False):
+    async def publish_message(self, topic: str, payload: Union[str, bytes], qos: int = 1, retain: bool = False):
         """Publish a message to MQTT broker with HTTP/3 optimization."""
         if self.client:
             try:
                 await self.client.publish(topic, payload, qos=qos, retain=retain)
-                logger.debug(f"Published message to {topic}")
+                logger.debug("Published message to %s", topic)
             except Exception as e:
-                logger.error(f"Failed to publish message to {topic}: {e}")
+                logger.error("Failed to publish message to %s: %s", topic, e)
         else:
             logger.warning("MQTT client not available, cannot publish message")
     
+    async def _worker(self, queue: asyncio.Queue):
+        """Drain the incoming message queue and dispatch to handlers."""
+        while True:
+            message = await queue.get()
+            try:
+                await self.handle_message(message)
+            finally:
+                queue.task_done()
+    
     async def run(self, use_websocket: bool = False):
         """Run the optimized MQTT service."""
         logger.info("Starting optimized MQTT service for HTTP/3 architecture...")
-        logger.info(f"WebSocket mode: {use_websocket}")
+        logger.info("WebSocket mode: %s", use_websocket)
+        
+        # Small, dedicated pool for parsing large payloads off the event loop
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4))
         
         while self.running and self.connection_retries < self.max_retries:
             try:
@@ -386,32 +481,63 @@ class OptimizedMQTTService:
                     self.client = client
                     await self.on_connect(client)
                     
+                    # Decouple socket reads from processing so a slow handler
+                    # does not back pressure up into the broker connection
+                    queue = asyncio.Queue(maxsize=self.queue_size)
+                    workers = [
+                        asyncio.create_task(self._worker(queue))
+                        for _ in range(self.worker_count)
+                    ]
+                    
                     # Main message processing loop
-                    async for message in client.messages:
-                        if not self.running:
-                            break
-                        await self.handle_message(message)
+                    try:
+                        async for message in client.messages:
+                            if not self.running:
+                                break
+                            await queue.put(message)
+                    finally:
+                        for worker in workers:
+                            worker.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
                         
             except aiomqtt.MqttError as e:
                 self.connection_retries += 1
-                logger.error(f"MQTT connection error (attempt {self.connection_retries}/{self.max_retries}): {e}")
+                logger.error("MQTT connection error (attempt %s/%s): %s", self.connection_retries, self.max_retries, e)
                 
                 if self.connection_retries < self.max_retries:
-                    logger.info(f"Retrying in {self.retry_delay} seconds...")
+                    logger.info("Retrying in %s seconds...", self.retry_delay)
                     await asyncio.sleep(self.retry_delay)
-                    self.retry_delay *= 2  # Exponential backoff
+                    self.retry_delay = min(self.retry_delay * 2, self.max_retry_delay)  # Exponential backoff
                 else:
                     logger.error("Max retries reached, giving up")
                     return False
                     
             except Exception as e:
-                logger.error(f"Unexpected error in MQTT service: {e}")
+                logger.error("Unexpected error in MQTT service: %s", e)
                 return False
         
         logger.info("Optimized MQTT service stopped")
         return True
 
 
+def run_event_loop(coro):
+    """Run a coroutine to completion, on uvloop when it is available."""
+    # libuv-backed event loop roughly doubles small-message throughput;
+    # uvloop.run() replaces the deprecated uvloop.install() policy hook
+    if uvloop is not None and sys.platform != 'win32':
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def run_worker(worker_id: int, use_websocket: bool = False, use_ssl: bool = False):
+    """Run one service instance as a member of the shared subscription group."""
+    mqtt_service = OptimizedMQTTService(
+        worker_id=worker_id, shared_subscription=True, use_ssl=use_ssl
+    )
+    success = run_event_loop(mqtt_service.run(use_websocket=use_websocket))
+    sys.exit(0 if success else 1)
+
+
 class Command(BaseCommand):
     """Django management command to run optimized MQTT service."""
     
@@ -428,6 +554,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Force SSL/TLS connection',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes sharing the subscriptions (default: 1)',
+        )
         parser.add_argument(
             '--daemon',
             action='store_true',
@@ -447,15 +579,20 @@ class Command(BaseCommand):
             settings.MQTT_USE_SSL = True
         
         logger.info("Starting Naboom Community Optimized MQTT Service")
-        logger.info(f"HTTP/3 Architecture: Enabled")
-        logger.info(f"WebSocket mode: {options['websocket']}")
-        logger.info(f"SSL/TLS enabled: {getattr(settings, 'MQTT_USE_SSL', False)}")
+        logger.info("HTTP/3 Architecture: Enabled")
+        logger.info("WebSocket mode: %s", options['websocket'])
+        logger.info("SSL/TLS enabled: %s", getattr(settings, 'MQTT_USE_SSL', False))
         
-        # Create and run MQTT service
-        mqtt_service = OptimizedMQTTService()
+        if uvloop is not None and sys.platform != 'win32':
+            logger.info("Using uvloop event loop")
         
         try:
-            success = asyncio.run(mqtt_service.run(use_websocket=options['websocket']))
+            if options['workers'] > 1:
+                success = self.run_workers(options['workers'], options['websocket'])
+            else:
+                # Create and run MQTT service
+                mqtt_service = OptimizedMQTTService()
+                success = run_event_loop(mqtt_service.run(use_websocket=options['websocket']))
             
             if success:
                 self.stdout.write(
@@ -472,8 +609,50 @@ class Command(BaseCommand):
                 self.style.WARNING('Optimized MQTT service interrupted by user')
             )
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             self.stdout.write(
                 self.style.ERROR(f'Optimized MQTT service failed: {e}')
             )
             sys.exit(1)
+    
+    def run_workers(self, workers: int, use_websocket: bool) -> bool:
+        """Fork worker processes that split the topics via shared subscriptions."""
+        logger.info("Starting %s MQTT worker processes (group: %s)", workers, SHARED_SUBSCRIPTION_GROUP)
+        
+        # Workers reuse this process's configured Django, so always fork
+        # (spawn/forkserver, the default on newer Pythons, would start them
+        # bare); the SSL flag is still passed explicitly rather than relying
+        # on the --ssl settings override being inherited
+        mp_context = multiprocessing.get_context('fork')
+        use_ssl = getattr(settings, 'MQTT_USE_SSL', False)
+        processes = [
+            mp_context.Process(
+                target=run_worker,
+                args=(worker_id, use_websocket, use_ssl),
+                name=f'naboom-mqtt-worker-{worker_id}',
+            )
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        # Installed after the fork so workers keep their own handlers
+        signal.signal(signal.SIGTERM, self._exit_on_signal)
+        
+        try:
+            for process in processes:
+                process.join()
+        finally:
+            # Reached on Ctrl+C, SIGTERM (e.g. systemd stop) or any other
+            # error, so the workers never outlive the parent
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+        
+        return all(process.exitcode == 0 for process in processes)
+    
+    def _exit_on_signal(self, signum, frame):
+        """Turn SIGTERM into SystemExit so run_workers stops its workers."""
+        logger.info("Received signal %s, stopping worker processes...", signum)
+        sys.exit(0)
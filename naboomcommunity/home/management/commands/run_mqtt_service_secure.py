@@ -2,41 +2,102 @@
 import asyncio
 import json
 import logging
+import random
 import signal
 import ssl
 import sys
 import time
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple, Union
 
 import aiomqtt
+from paho.mqtt.matcher import MQTTMatcher
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib codec
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on messages dispatched together, to keep per-message latency low
+MAX_BATCH_SIZE = 64
+
+# Upper bound on the reconnect backoff, in seconds
+MAX_RETRY_DELAY = 60
+
+# Payloads at least this large are JSON-decoded in the default thread pool
+LARGE_PAYLOAD_BYTES = 4096
+
+# Static part of the health status document; the timestamp is appended per check
+HEALTH_PAYLOAD_PREFIX = (
+    b'{"status":"healthy",'
+    b'"services":{"django":"running","celery":"running","daphne":"running","mqtt":"running"},'
+    b'"timestamp":'
+)
+
+# orjson parses several times faster than json; its JSONDecodeError
+# subclasses json.JSONDecodeError
+decode_json = orjson.loads if orjson is not None else json.loads
+
 
 class SecureMQTTService:
     """Secure MQTT service for Naboom Community with authentication and SSL support."""
     
     def __init__(self):
         self.client: Optional[aiomqtt.Client] = None
-        self.running = True
-        self.setup_signal_handlers()
+        self._shutdown = asyncio.Event()
+        
+        # Resolve connection settings and the SSL context (which loads the CA
+        # store) once, rather than on every connection attempt. The SSL flag
+        # is read here rather than at import so the --ssl override applies.
+        self.use_ssl = getattr(settings, 'MQTT_USE_SSL', False)
+        self._ssl_ctx = self.create_ssl_context()
+        self._mqtt_kwargs = self.get_client_kwargs()
+        
+        # Static routing tables, built once instead of per message.
+        # The trie maps topic filters to category handlers in O(depth); each
+        # '+' level is passed to the handler as a positional argument.
+        self._topic_matcher = MQTTMatcher()
+        self._topic_matcher["naboom/community/+/+"] = self.handle_community_message
+        self._topic_matcher["naboom/system/+"] = self.handle_system_message
+        self._topic_matcher["naboom/notifications/+"] = self.handle_notification_message
+        self._topic_matcher["naboom/alerts/+"] = self.handle_alert_message
+        self._dispatch = {
+            'community': {
+                "post": self.handle_new_post,
+                "comment": self.handle_new_comment,
+                "user_join": self.handle_user_join,
+                "user_leave": self.handle_user_leave,
+                "update": self.handle_community_update,
+            },
+            'system': {
+                "status": self.handle_system_status,
+                "health_check": self.handle_health_check,
+                "metrics": self.handle_system_metrics,
+            },
+            'alerts': {
+                "panic": self.handle_panic_alert,
+                "emergency": self.handle_emergency_alert,
+                "community": self.handle_community_alert,
+            },
+        }
         
     def setup_signal_handlers(self):
-        """Setup signal handlers for graceful shutdown."""
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
+        """Setup signal handlers for graceful shutdown on the running loop."""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.signal_handler, signum)
         
-    def signal_handler(self, signum, frame):
-        """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.running = False
-        sys.exit(0)
+    def signal_handler(self, signum):
+        """Handle shutdown signals by asking the main loop to stop."""
+        logger.info("Received signal %s, shutting down gracefully...", signum)
+        self._shutdown.set()
     
     def create_ssl_context(self) -> Optional[ssl.SSLContext]:
         """Create SSL context for secure MQTT connections."""
-        if not getattr(settings, 'MQTT_USE_SSL', False):
+        if not self.use_ssl:
             return None
             
         try:
@@ -49,34 +110,27 @@ class SecureMQTTService:
             
             return ssl_context
         except Exception as e:
-            logger.error(f"Failed to create SSL context: {e}")
+            logger.error("Failed to create SSL context: %s", e)
             return None
     
+    def get_client_kwargs(self) -> dict:
+        """Read MQTT connection settings from Django settings."""
+        return {
+            'hostname': getattr(settings, 'MQTT_HOST', 'localhost'),
+            'port': getattr(settings, 'MQTT_SSL_PORT' if self.use_ssl else 'MQTT_PORT', 1883),
+            'username': getattr(settings, 'MQTT_USERNAME', None),
+            'password': getattr(settings, 'MQTT_PASSWORD', None),
+            'identifier': getattr(settings, 'MQTT_CLIENT_ID', 'naboom-community'),
+            'keepalive': getattr(settings, 'MQTT_KEEPALIVE', 60),
+            # Bound client-side queues so a slow consumer can't grow memory
+            'max_queued_incoming_messages': getattr(settings, 'MQTT_MAX_QUEUED_INCOMING_MESSAGES', 10_000),
+            'max_inflight_messages': getattr(settings, 'MQTT_MAX_INFLIGHT_MESSAGES', 20),
+            'max_concurrent_outgoing_calls': getattr(settings, 'MQTT_MAX_CONCURRENT_OUTGOING_CALLS', 100),
+        }
+    
     def get_mqtt_client(self) -> aiomqtt.Client:
-        """Create and configure MQTT client with authentication and SSL support."""
-        # Get MQTT settings from Django settings
-        mqtt_host = getattr(settings, 'MQTT_HOST', 'localhost')
-        mqtt_port = getattr(settings, 'MQTT_SSL_PORT' if getattr(settings, 'MQTT_USE_SSL', False) else 'MQTT_PORT', 1883)
-        mqtt_username = getattr(settings, 'MQTT_USERNAME', None)
-        mqtt_password = getattr(settings, 'MQTT_PASSWORD', None)
-        mqtt_client_id = getattr(settings, 'MQTT_CLIENT_ID', 'naboom-community')
-        mqtt_keepalive = getattr(settings, 'MQTT_KEEPALIVE', 60)
-        
-        # Create SSL context if needed
-        tls_context = self.create_ssl_context()
-        
-        # Create MQTT client with authentication
-        client = aiomqtt.Client(
-            hostname=mqtt_host,
-            port=mqtt_port,
-            username=mqtt_username,
-            password=mqtt_password,
-            identifier=mqtt_client_id,
-            keepalive=mqtt_keepalive,
-            tls_context=tls_context,
-        )
-        
-        return client
+        """Create MQTT client with authentication and SSL support."""
+        return aiomqtt.Client(**self._mqtt_kwargs, tls_context=self._ssl_ctx)
     
     async def on_connect(self, client: aiomqtt.Client):
         """Callback for when the client connects to the broker."""
@@ -92,212 +146,216 @@ class SecureMQTTService:
         
         for topic in topics:
             await client.subscribe(topic)
-            logger.info(f"Subscribed to topic: {topic}")
+            logger.info("Subscribed to topic: %s", topic)
     
     async def on_disconnect(self, client: aiomqtt.Client):
         """Callback for when the client disconnects from the broker."""
         logger.info("Disconnected from MQTT broker")
     
+    async def parse_payload(self, payload: bytes) -> dict:
+        """Decode a JSON payload, moving large ones off the event loop."""
+        if not payload:
+            return {}
+        if len(payload) < LARGE_PAYLOAD_BYTES:
+            return decode_json(payload)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, decode_json, payload)
+    
     async def handle_message(self, message: aiomqtt.Message):
         """Handle incoming MQTT messages."""
         try:
-            topic = str(message.topic)
-            payload = message.payload.decode('utf-8') if message.payload else ""
+            # Topic.value is the already-decoded string; str() would rebuild it
+            topic = message.topic.value
+            # Keep the raw bytes for the JSON decoder; the log only needs the size
+            payload = message.payload or b""
             
-            logger.info(f"Received message on topic '{topic}': {payload}")
+            logger.debug("Received message on topic '%s' (%d bytes)", topic, len(payload))
             
-            # Parse topic structure: naboom/{category}/{subcategory}/{action}
-            topic_parts = topic.split('/')
-            if len(topic_parts) >= 4 and topic_parts[0] == 'naboom':
-                category = topic_parts[1]
-                
-                if category == 'community':
-                    await self.handle_community_message(topic_parts[2], topic_parts[3], payload)
-                elif category == 'system':
-                    await self.handle_system_message(topic_parts[2], payload)
-                elif category == 'notifications':
-                    await self.handle_notification_message(topic_parts[2], payload)
-                elif category == 'alerts':
-                    await self.handle_alert_message(topic_parts[2], payload)
+            # Cheap prefix check before walking the matcher trie
+            if not topic.startswith("naboom/"):
+                return
+            
+            # Topic structure: naboom/{category}/{subcategory}[/{action}]
+            for handler in self._topic_matcher.iter_match(topic):
+                await handler(*topic.split('/')[2:], payload)
                     
         except Exception as e:
-            logger.error(f"Error processing MQTT message: {e}")
+            logger.error("Error processing MQTT message: %s", e)
     
-    async def handle_community_message(self, channel_id: str, action: str, payload: str):
+    async def handle_community_message(self, channel_id: str, action: str, payload: bytes):
         """Handle community-related MQTT messages."""
         try:
-            data = json.loads(payload) if payload else {}
-            logger.info(f"Community message - Channel: {channel_id}, Action: {action}, Data: {data}")
+            # Empty (keepalive-style) payloads skip both the parse and the log
+            data = await self.parse_payload(payload)
+            if data:
+                logger.info("Community message - Channel: %s, Action: %s, Data: %s", channel_id, action, data)
             
             # Route to specific handlers based on action
-            handler_map = {
-                "post": self.handle_new_post,
-                "comment": self.handle_new_comment,
-                "user_join": self.handle_user_join,
-                "user_leave": self.handle_user_leave,
-                "update": self.handle_community_update,
-            }
-            
-            handler = handler_map.get(action)
+            handler = self._dispatch['community'].get(action)
             if handler:
                 await handler(channel_id, data)
             else:
-                logger.warning(f"Unknown community action: {action}")
+                logger.warning("Unknown community action: %s", action)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in community message: {payload}")
+            logger.error("Invalid JSON in community message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling community message: {e}")
+            logger.error("Error handling community message: %s", e)
     
-    async def handle_system_message(self, action: str, payload: str):
+    async def handle_system_message(self, action: str, payload: bytes):
         """Handle system-related MQTT messages."""
         try:
-            data = json.loads(payload) if payload else {}
-            logger.info(f"System message - Action: {action}, Data: {data}")
+            data = await self.parse_payload(payload)
+            if data:
+                logger.info("System message - Action: %s, Data: %s", action, data)
             
-            handler_map = {
-                "status": self.handle_system_status,
-                "health_check": self.handle_health_check,
-                "metrics": self.handle_system_metrics,
-            }
-            
-            handler = handler_map.get(action)
+            handler = self._dispatch['system'].get(action)
             if handler:
                 await handler(data)
             else:
-                logger.warning(f"Unknown system action: {action}")
+                logger.warning("Unknown system action: %s", action)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in system message: {payload}")
+            logger.error("Invalid JSON in system message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling system message: {e}")
+            logger.error("Error handling system message: %s", e)
     
-    async def handle_notification_message(self, user_id: str, payload: str):
+    async def handle_notification_message(self, user_id: str, payload: bytes):
         """Handle notification-related MQTT messages."""
         try:
-            data = json.loads(payload) if payload else {}
-            logger.info(f"Notification message - User: {user_id}, Data: {data}")
+            data = await self.parse_payload(payload)
+            if data:
+                logger.info("Notification message - User: %s, Data: %s", user_id, data)
             
             await self.send_user_notification(user_id, data)
             
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in notification message: {payload}")
+            logger.error("Invalid JSON in notification message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling notification message: {e}")
+            logger.error("Error handling notification message: %s", e)
     
-    async def handle_alert_message(self, alert_type: str, payload: str):
+    async def handle_alert_message(self, alert_type: str, payload: bytes):
         """Handle emergency alert MQTT messages."""
         try:
-            data = json.loads(payload) if payload else {}
-            logger.info(f"Alert message - Type: {alert_type}, Data: {data}")
+            data = await self.parse_payload(payload)
+            if data:
+                logger.info("Alert message - Type: %s, Data: %s", alert_type, data)
             
             # Route to specific alert handlers
-            handler_map = {
-                "panic": self.handle_panic_alert,
-                "emergency": self.handle_emergency_alert,
-                "community": self.handle_community_alert,
-            }
-            
-            handler = handler_map.get(alert_type)
+            handler = self._dispatch['alerts'].get(alert_type)
             if handler:
                 await handler(data)
             else:
-                logger.warning(f"Unknown alert type: {alert_type}")
+                logger.warning("Unknown alert type: %s", alert_type)
                 
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in alert message: {payload}")
+            logger.error("Invalid JSON in alert message: %s", payload)
         except Exception as e:
-            logger.error(f"Error handling alert message: {e}")
+            logger.error("Error handling alert message: %s", e)
     
     # Community message handlers
     async def handle_new_post(self, channel_id: str, data: dict):
         """Handle new post notifications."""
-        logger.info(f"New post in channel {channel_id}: {data}")
+        logger.info("New post in channel %s: %s", channel_id, data)
         # Add your post handling logic here
         
     async def handle_new_comment(self, channel_id: str, data: dict):
         """Handle new comment notifications."""
-        logger.info(f"New comment in channel {channel_id}: {data}")
+        logger.info("New comment in channel %s: %s", channel_id, data)
         # Add your comment handling logic here
         
     async def handle_user_join(self, channel_id: str, data: dict):
         """Handle user join notifications."""
-        logger.info(f"User joined channel {channel_id}: {data}")
+        logger.info("User joined channel %s: %s", channel_id, data)
         # Add your user join logic here
         
     async def handle_user_leave(self, channel_id: str, data: dict):
         """Handle user leave notifications."""
-        logger.info(f"User left channel {channel_id}: {data}")
+        logger.info("User left channel %s: %s", channel_id, data)
         # Add your user leave logic here
         
     async def handle_community_update(self, channel_id: str, data: dict):
         """Handle community update notifications."""
-        logger.info(f"Community update in channel {channel_id}: {data}")
+        logger.info("Community update in channel %s: %s", channel_id, data)
         # Add your community update logic here
     
     # System message handlers
     async def handle_system_status(self, data: dict):
         """Handle system status updates."""
-        logger.info(f"System status update: {data}")
+        logger.info("System status update: %s", data)
         # Add your system status logic here
         
     async def handle_health_check(self, data: dict):
         """Handle health check requests."""
-        logger.info(f"Health check request: {data}")
-        # Publish health status
-        health_data = {
-            "status": "healthy",
-            "timestamp": time.time(),
-            "services": {
-                "django": "running",
-                "celery": "running",
-                "daphne": "running",
-                "mqtt": "running"
-            }
-        }
-        await self.publish_message("naboom/system/health", json.dumps(health_data))
+        logger.info("Health check request: %s", data)
+        # Publish health status; only the timestamp changes between checks
+        payload = HEALTH_PAYLOAD_PREFIX + str(time.time()).encode() + b'}'
+        await self.publish_message("naboom/system/health", payload)
         
     async def handle_system_metrics(self, data: dict):
         """Handle system metrics updates."""
-        logger.info(f"System metrics update: {data}")
+        logger.info("System metrics update: %s", data)
         # Add your metrics handling logic here
     
     # Notification handlers
     async def send_user_notification(self, user_id: str, data: dict):
         """Send notification to specific user."""
-        logger.info(f"Sending notification to user {user_id}: {data}")
+        logger.info("Sending notification to user %s: %s", user_id, data)
         # Add your notification logic here
     
     # Alert handlers
     async def handle_panic_alert(self, data: dict):
         """Handle panic alert messages."""
-        logger.info(f"Panic alert received: {data}")
+        logger.info("Panic alert received: %s", data)
         # Add your panic alert logic here
         
     async def handle_emergency_alert(self, data: dict):
         """Handle emergency alert messages."""
-        logger.info(f"Emergency alert received: {data}")
+        logger.info("Emergency alert received: %s", data)
         # Add your emergency alert logic here
         
     async def handle_community_alert(self, data: dict):
         """Handle community alert messages."""
-        logger.info(f"Community alert received: {data}")
+        logger.info("Community alert received: %s", data)
         # Add your community alert logic here
     
-    async def publish_message(self, topic: str, payload: str, qos: int = 0, retain: bool = False):
+    async def publish_message(self, topic: str, payload: Union[str, bytes], qos: int = 0, retain: bool = False):
         """Publish a message to MQTT broker."""
         if self.client:
             try:
                 await self.client.publish(topic, payload, qos=qos, retain=retain)
-                logger.debug(f"Published message to {topic}")
+                logger.debug("Published message to %s", topic)
             except Exception as e:
-                logger.error(f"Failed to publish message to {topic}: {e}")
+                logger.error("Failed to publish message to %s: %s", topic, e)
         else:
             logger.warning("MQTT client not available, cannot publish message")
     
+    async def publish_batch(self, messages: List[Tuple[str, Union[str, bytes]]], qos: int = 0, retain: bool = False):
+        """Publish several (topic, payload) messages concurrently."""
+        if not self.client:
+            logger.warning("MQTT client not available, cannot publish messages")
+            return
+        
+        results = await asyncio.gather(
+            *(self.client.publish(topic, payload, qos=qos, retain=retain) for topic, payload in messages),
+            return_exceptions=True,
+        )
+        for (topic, _), result in zip(messages, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to publish message to %s: %s", topic, result)
+    
+    async def consume_messages(self, client: aiomqtt.Client):
+        """Coalesce whatever is already queued into a batch and dispatch it concurrently."""
+        async for message in client.messages:
+            batch = [message]
+            while len(batch) < MAX_BATCH_SIZE and len(client.messages):
+                batch.append(await anext(client.messages))
+            await asyncio.gather(*(self.handle_message(m) for m in batch))
+    
     async def run(self):
         """Run the secure MQTT service."""
         logger.info("Starting secure MQTT service...")
+        self.setup_signal_handlers()
         
         # Create MQTT client
         self.client = self.get_mqtt_client()
@@ -307,28 +365,39 @@ class SecureMQTTService:
         retry_delay = 5
         
         for attempt in range(max_retries):
+            if self._shutdown.is_set():
+                break
             try:
                 async with self.client as client:
                     self.client = client
                     await self.on_connect(client)
                     
-                    # Main message processing loop
-                    async for message in client.messages:
-                        if not self.running:
-                            break
-                        await self.handle_message(message)
+                    # Consume until the connection drops or a shutdown is
+                    # requested; leaving the context then sends a clean DISCONNECT
+                    consumer = asyncio.create_task(self.consume_messages(client))
+                    stopper = asyncio.create_task(self._shutdown.wait())
+                    await asyncio.wait({consumer, stopper}, return_when=asyncio.FIRST_COMPLETED)
+                    stopper.cancel()
+                    if consumer.done():
+                        consumer.result()  # re-raise connection errors
+                    else:
+                        consumer.cancel()
+                        await asyncio.gather(consumer, return_exceptions=True)
+                        break
                         
             except aiomqtt.MqttError as e:
-                logger.error(f"MQTT connection error (attempt {attempt + 1}/{max_retries}): {e}")
+                logger.error("MQTT connection error (attempt %s/%s): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
-                    logger.info(f"Retrying in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
+                    # Jitter desynchronizes clients that lost the broker together
+                    delay = retry_delay * (0.5 + random.random())
+                    logger.info("Retrying in %.1f seconds...", delay)
+                    await asyncio.sleep(delay)
+                    retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)  # Exponential backoff
                 else:
                     logger.error("Max retries reached, giving up")
                     return False
             except Exception as e:
-                logger.error(f"Unexpected error in MQTT service: {e}")
+                logger.error("Unexpected error in MQTT service: %s", e)
                 return False
         
         logger.info("Secure MQTT service stopped")
@@ -365,7 +434,7 @@ class Command(BaseCommand):
             settings.MQTT_USE_SSL = True
         
         logger.info("Starting Naboom Community Secure MQTT Service")
-        logger.info(f"SSL/TLS enabled: {getattr(settings, 'MQTT_USE_SSL', False)}")
+        logger.info("SSL/TLS enabled: %s", getattr(settings, 'MQTT_USE_SSL', False))
         
         # Create and run MQTT service
         mqtt_service = SecureMQTTService()
@@ -388,7 +457,7 @@ class Command(BaseCommand):
                 self.style.WARNING('Secure MQTT service interrupted by user')
             )
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             self.stdout.write(
                 self.style.ERROR(f'Secure MQTT service failed: {e}')
             )
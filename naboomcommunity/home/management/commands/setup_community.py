@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from home.utils import create_default_groups_and_roles
 from home.models import UserGroup, UserRole
@@ -45,7 +47,9 @@ class Command(BaseCommand):
         # Create default groups and roles
         self.stdout.write('Creating default groups and roles...')
         try:
-            created_data = create_default_groups_and_roles()
+            # Commit all the group/role writes together instead of one by one
+            with transaction.atomic():
+                created_data = create_default_groups_and_roles()
             
             self.stdout.write(
                 self.style.SUCCESS(
@@ -74,18 +78,24 @@ class Command(BaseCommand):
         if options['create_superuser']:
             self.stdout.write('\nCreating superuser...')
             try:
-                if User.objects.filter(username=options['username']).exists():
+                # One lookup when the user exists, one INSERT otherwise; the
+                # password is only hashed (a deliberately slow step) on create
+                superuser, created = User.objects.get_or_create(
+                    username=options['username'],
+                    defaults={
+                        'email': options['email'],
+                        'is_staff': True,
+                        'is_superuser': True,
+                        'password': lambda: make_password(options['password']),
+                    }
+                )
+                if not created:
                     self.stdout.write(
                         self.style.WARNING(
                             f'User "{options["username"]}" already exists. Skipping superuser creation.'
                         )
                     )
                 else:
-                    superuser = User.objects.create_superuser(
-                        username=options['username'],
-                        email=options['email'],
-                        password=options['password']
-                    )
                     self.stdout.write(
                         self.style.SUCCESS(
                             f'Superuser "{superuser.username}" created successfully!'
@@ -1,6 +1,8 @@
 """
 Management command to setup MinIO buckets for the application.
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import boto3
 from botocore.exceptions import ClientError
 from django.core.management.base import BaseCommand
@@ -60,20 +62,27 @@ class Command(BaseCommand):
 
         # Create folder structure
         folders = ['static/', 'media/', 'documents/']
-        for folder in folders:
-            try:
-                s3_client.put_object(
+        with ThreadPoolExecutor(max_workers=len(folders)) as executor:
+            futures = {
+                executor.submit(
+                    s3_client.put_object,
                     Bucket=bucket_name,
                     Key=folder,
                     Body=b''
-                )
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created folder "{folder}" in bucket "{bucket_name}"')
-                )
-            except ClientError as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Could not create folder "{folder}": {e}')
-                )
+                ): folder
+                for folder in folders
+            }
+            for future in as_completed(futures):
+                folder = futures[future]
+                try:
+                    future.result()
+                    self.stdout.write(
+                        self.style.SUCCESS(f'Created folder "{folder}" in bucket "{bucket_name}"')
+                    )
+                except ClientError as e:
+                    self.stdout.write(
+                        self.style.WARNING(f'Could not create folder "{folder}": {e}')
+                    )
 
         self.stdout.write(
             self.style.SUCCESS('MinIO setup completed successfully!')
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.contrib.auth import get_user_model
 from home.models import UserGroup, UserRole, UserGroupMembership
 
@@ -8,64 +9,66 @@ User = get_user_model()
 class Command(BaseCommand):
     help = 'Set up sample data for user groups and roles'
 
+    def bulk_create_by_name(self, model, rows, label):
+        """Insert the rows whose name doesn't exist yet in a single query."""
+        names = [row['name'] for row in rows]
+        existing = set(
+            model.objects.filter(name__in=names).values_list('name', flat=True)
+        )
+        model.objects.bulk_create(
+            [model(**row) for row in rows if row['name'] not in existing]
+        )
+
+        for name in names:
+            if name in existing:
+                self.stdout.write(
+                    self.style.WARNING(f'{label} already exists: {name}')
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Created {label.lower()}: {name}')
+                )
+
+    @transaction.atomic
     def handle(self, *args, **options):
-        """Create sample user groups and roles."""
+        """Create sample user groups and roles in a single transaction."""
         
         # Create sample user groups
         groups_data = [
             {
                 'name': 'Members',
-                'description': 'General community members',
-                'is_active': True
+                'description': 'General community members'
             },
             {
                 'name': 'Choir',
-                'description': 'Community choir group',
-                'is_active': True
+                'description': 'Community choir group'
             },
             {
                 'name': 'Youth',
-                'description': 'Youth group for ages 13-25',
-                'is_active': True
+                'description': 'Youth group for ages 13-25'
             },
             {
                 'name': 'Elders',
-                'description': 'Elderly community members group',
-                'is_active': True
+                'description': 'Elderly community members group'
             },
             {
                 'name': 'Tech Support',
-                'description': 'Technical support volunteers',
-                'is_active': True
+                'description': 'Technical support volunteers'
             },
             {
                 'name': 'Event Organizers',
-                'description': 'Community event organizers',
-                'is_active': True
+                'description': 'Community event organizers'
             }
         ]
         
-        for group_data in groups_data:
-            group, created = UserGroup.objects.get_or_create(
-                name=group_data['name'],
-                defaults=group_data
-            )
-            if created:
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created group: {group.name}')
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING(f'Group already exists: {group.name}')
-                )
+        self.bulk_create_by_name(UserGroup, groups_data, 'Group')
         
         # Create sample user roles
         roles_data = [
             {
                 'name': 'Member',
                 'description': 'Basic member role',
-                'permissions': {},
-                'is_active': True
+                'permissions': {}
             },
             {
                 'name': 'Leader',
@@ -73,8 +76,7 @@ class Command(BaseCommand):
                 'permissions': {
                     'can_manage_members': True,
                     'can_organize_events': True
-                },
-                'is_active': True
+                }
             },
             {
                 'name': 'Moderator',
@@ -82,8 +84,7 @@ class Command(BaseCommand):
                 'permissions': {
                     'can_moderate_content': True,
                     'can_manage_events': True
-                },
-                'is_active': True
+                }
             },
             {
                 'name': 'Coordinator',
@@ -91,24 +92,11 @@ class Command(BaseCommand):
                 'permissions': {
                     'can_organize_events': True,
                     'can_manage_resources': True
-                },
-                'is_active': True
+                }
             }
         ]
         
-        for role_data in roles_data:
-            role, created = UserRole.objects.get_or_create(
-                name=role_data['name'],
-                defaults=role_data
-            )
-            if created:
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created role: {role.name}')
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING(f'Role already exists: {role.name}')
-                )
+        self.bulk_create_by_name(UserRole, roles_data, 'Role')
         
         # Create a sample user if none exists
         if not User.objects.exists():
@@ -129,13 +117,33 @@ class Command(BaseCommand):
         default_group = UserGroup.objects.get(name='Members')
         default_role = UserRole.objects.get(name='Member')
         
-        for user in User.objects.all():
-            membership, created = UserGroupMembership.objects.get_or_create(
-                user=user,
-                group=default_group,
-                defaults={'role': default_role}
+        existing = set(
+            UserGroupMembership.objects.filter(group=default_group)
+            .values_list('user_id', flat=True)
+        )
+        last_id = 0
+        while True:
+            # Fetch users in keyset batches so memory stays bounded and no
+            # cursor is left open while bulk_create writes
+            users = list(
+                User.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'username')[:1000]
             )
-            if created:
+            if not users:
+                break
+            last_id = users[-1].id
+
+            unassigned = [user for user in users if user.id not in existing]
+            UserGroupMembership.objects.bulk_create([
+                UserGroupMembership(
+                    user_id=user.id,
+                    group=default_group,
+                    role=default_role
+                )
+                for user in unassigned
+            ])
+            for user in unassigned:
                 self.stdout.write(
                     self.style.SUCCESS(f'Assigned {user.username} to {default_group.name}')
                 )
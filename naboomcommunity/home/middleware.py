@@ -6,6 +6,28 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Responses browsers never run script from skip CSP; everything else,
+# including any XML document (XHTML, SVG, text/xml...), gets the policy
+INERT_CONTENT_TYPES = frozenset({
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/css',
+})
+INERT_CONTENT_TYPE_PREFIXES = ('image/', 'font/')
+
+
+def is_inert_content_type(content_type):
+    """Return True for media types that cannot execute script in a browser."""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if media_type in INERT_CONTENT_TYPES or media_type.endswith('+json'):
+        return True
+    # Raster images and fonts are inert, but SVG is an XML document
+    return media_type.startswith(INERT_CONTENT_TYPE_PREFIXES) and not media_type.endswith('+xml')
+
+# Upstream policy headers that would otherwise be enforced alongside ours
+CSP_HEADERS_TO_CLEAR = ('Content-Security-Policy-Report-Only',)
+
 
 class CSPMiddleware:
     """
@@ -13,31 +35,16 @@ class CSPMiddleware:
     This middleware runs after all other middleware to override any existing CSP headers.
     """
     
+    __slots__ = ('get_response', '_admin_prefix', '_csp_default', '_csp_admin')
+    
     def __init__(self, get_response):
         self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
+        self._admin_prefix = '/admin/'
         
-        # Log existing CSP headers for debugging
-        existing_csp = response.get('Content-Security-Policy', 'None')
-        logger.info(f"Existing CSP header: {existing_csp}")
-        
-        # Remove any existing CSP headers to ensure our policy takes precedence
-        # Handle both HttpResponse and TemplateResponse objects
-        if hasattr(response, 'pop'):
-            # Regular HttpResponse object
-            response.pop('Content-Security-Policy', None)
-            response.pop('Content-Security-Policy-Report-Only', None)
-        else:
-            # TemplateResponse object - use del instead of pop
-            if 'Content-Security-Policy' in response:
-                del response['Content-Security-Policy']
-            if 'Content-Security-Policy-Report-Only' in response:
-                del response['Content-Security-Policy-Report-Only']
-        
-        # Set comprehensive CSP header to allow images from S3 and Gravatar
-        csp_policy = (
+        # Both policies are static, so build them once per process
+        # rather than on every response.
+        # Comprehensive CSP header to allow images from S3 and Gravatar
+        self._csp_default = (
             "default-src 'self'; "
             "img-src 'self' data: blob: https://s3.naboomneighbornet.net.za https://www.gravatar.com https://*.gravatar.com; "
             "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
@@ -49,24 +56,37 @@ class CSPMiddleware:
             "base-uri 'self'; "
             "form-action 'self';"
         )
-        
         # For admin pages, be more permissive with image sources
-        if request.path.startswith('/admin/'):
-            csp_policy = (
-                "default-src 'self'; "
-                "img-src 'self' data: blob: https: http:; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "font-src 'self' data:; "
-                "connect-src 'self'; "
-                "frame-src 'self'; "
-                "object-src 'none'; "
-                "base-uri 'self'; "
-                "form-action 'self';"
-            )
+        self._csp_admin = (
+            "default-src 'self'; "
+            "img-src 'self' data: blob: https: http:; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline'; "
+            "font-src 'self' data:; "
+            "connect-src 'self'; "
+            "frame-src 'self'; "
+            "object-src 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self';"
+        )
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if is_inert_content_type(response.get('Content-Type', '')):
+            return response
+        
+        # Log existing CSP headers for debugging
+        logger.debug("Existing CSP header: %s", response.get('Content-Security-Policy'))
+        
+        # Remove other policies so ours is the only one in effect; the
+        # enforcing header itself is overwritten below
+        for header in CSP_HEADERS_TO_CLEAR:
+            response.headers.pop(header, None)
+        
+        path = request.path
+        csp_policy = self._csp_admin if path.startswith(self._admin_prefix) else self._csp_default
         
         # Set the CSP header
         response['Content-Security-Policy'] = csp_policy
-        logger.info(f"Set CSP header: {csp_policy}")
         
         return response
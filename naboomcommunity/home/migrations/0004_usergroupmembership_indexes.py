@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_alter_usergroup_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usergroupmembership',
+            index=models.Index(fields=['user', 'is_active'], name='home_member_user_active'),
+        ),
+        migrations.AddIndex(
+            model_name='usergroupmembership',
+            index=models.Index(fields=['group', 'is_active'], name='home_member_group_active'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_usergroupmembership_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='city',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='province',
+            field=models.CharField(blank=True, db_index=True, max_length=100),
+        ),
+    ]
@@ -1,10 +1,36 @@
 """
 Custom models for the home app.
 """
+import functools
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from wagtail.images.models import Image, AbstractImage, AbstractRendition
+from wagtail.images.utils import generate_signature
+
+
+@functools.lru_cache(maxsize=4096)
+def get_rendition_signature(image_id, filter_spec):
+    """
+    Return the wagtailimages_serve HMAC signature for an image rendition.
+    
+    The signature depends only on the image id and filter spec, so it is
+    shared across all callers.
+    """
+    return generate_signature(image_id, filter_spec)
+
+
+def get_rendition_url(image_id, filter_spec):
+    """
+    Return the signed wagtailimages_serve URL for an image rendition.
+    
+    The URL is reversed on every call so it picks up the current script
+    prefix when the site is served under a sub-path.
+    """
+    signature = get_rendition_signature(image_id, filter_spec)
+    return reverse('wagtailimages_serve', args=[signature, image_id, filter_spec])
 
 
 class CustomImage(AbstractImage):
@@ -63,8 +89,8 @@ class UserProfile(models.Model):
         blank=True
     )
     address = models.TextField(blank=True)
-    city = models.CharField(max_length=100, blank=True)
-    province = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=100, blank=True, db_index=True)
+    province = models.CharField(max_length=100, blank=True, db_index=True)
     postal_code = models.CharField(max_length=20, blank=True)
     allergies = models.TextField(blank=True)
     medical_conditions = models.TextField(blank=True)
@@ -87,67 +113,59 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Small columns needed to render avatars and notification preferences;
+    # leaves out the address and medical TextFields
+    LITE_FIELDS = (
+        'user', 'avatar', 'preferred_language', 'timezone',
+        'email_notifications', 'sms_notifications',
+    )
+
     def __str__(self):
         return f"{self.user.get_full_name()} Profile"
     
+    def get_full_address(self):
+        """Get the address fields joined into a single line, or '' if none are set."""
+        parts = (self.address, self.city, self.province, self.postal_code)
+        return ', '.join(part for part in parts if part)
+    
+    @classmethod
+    def lite_for(cls, user_id):
+        """Get a user's profile with only the lightweight columns loaded."""
+        return cls.objects.only(*cls.LITE_FIELDS).get(user_id=user_id)
+    
     @property
     def avatar_url(self):
         """Get the URL of the user's avatar (medium size for better performance)."""
-        if self.avatar:
-            # Use medium size (150x150) as default for better performance
-            return self.get_avatar_medium()
-        return None
+        # Use medium size (150x150) as default for better performance
+        return self._avatar_url('fill-150x150')
+    
+    def _avatar_url(self, filter_spec):
+        """Get the serving URL of the avatar rendered with a Wagtail filter spec."""
+        if self.avatar_id is None:
+            return None
+        try:
+            return get_rendition_url(self.avatar_id, filter_spec)
+        except Exception:
+            # Fallback to original if rendition fails
+            if filter_spec != 'original':
+                return self._avatar_url('original')
+            return None
     
     def get_avatar_small(self):
         """Get a small version of the avatar (50x50px)."""
-        if self.avatar:
-            try:
-                from django.urls import reverse
-                from wagtail.images.utils import generate_signature
-                signature = generate_signature(self.avatar.id, 'fill-50x50')
-                return reverse('wagtailimages_serve', args=[signature, self.avatar.id, 'fill-50x50'])
-            except Exception:
-                # Fallback to original if rendition fails
-                return self.avatar_url()
-        return None
+        return self._avatar_url('fill-50x50')
     
     def get_avatar_medium(self):
         """Get a medium version of the avatar (150x150px)."""
-        if self.avatar:
-            try:
-                from django.urls import reverse
-                from wagtail.images.utils import generate_signature
-                signature = generate_signature(self.avatar.id, 'fill-150x150')
-                return reverse('wagtailimages_serve', args=[signature, self.avatar.id, 'fill-150x150'])
-            except Exception:
-                # Fallback to original if rendition fails
-                return self.avatar_url()
-        return None
+        return self._avatar_url('fill-150x150')
     
     def get_avatar_large(self):
         """Get a large version of the avatar (300x300px)."""
-        if self.avatar:
-            try:
-                from django.urls import reverse
-                from wagtail.images.utils import generate_signature
-                signature = generate_signature(self.avatar.id, 'fill-300x300')
-                return reverse('wagtailimages_serve', args=[signature, self.avatar.id, 'fill-300x300'])
-            except Exception:
-                # Fallback to original if rendition fails
-                return self.get_avatar_original()
-        return None
+        return self._avatar_url('fill-300x300')
     
     def get_avatar_original(self):
         """Get the original full-size avatar image."""
-        if self.avatar:
-            try:
-                from django.urls import reverse
-                from wagtail.images.utils import generate_signature
-                signature = generate_signature(self.avatar.id, 'original')
-                return reverse('wagtailimages_serve', args=[signature, self.avatar.id, 'original'])
-            except Exception:
-                return None
-        return None
+        return self._avatar_url('original')
 
 
 class UserGroup(models.Model):
@@ -177,6 +195,16 @@ class UserRole(models.Model):
         return self.name
 
 
+class UserGroupMembershipManager(models.Manager):
+    """
+    Join the user, group and role by default, since memberships are almost
+    always displayed through them (__str__, admin listings, serializers).
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'group', 'role')
+
+
 class UserGroupMembership(models.Model):
     """
     Many-to-many relationship between users and groups with roles.
@@ -187,8 +215,14 @@ class UserGroupMembership(models.Model):
     joined_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
+    objects = UserGroupMembershipManager()
+
     class Meta:
         unique_together = ['user', 'group']
+        indexes = [
+            models.Index(fields=['user', 'is_active'], name='home_member_user_active'),
+            models.Index(fields=['group', 'is_active'], name='home_member_group_active'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.group.name} ({self.role.name})"
\ No newline at end of file
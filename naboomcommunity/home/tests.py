@@ -1,47 +1,66 @@
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from .models import UserProfile, UserGroup, UserRole, UserGroupMembership
 from .forms import CustomUserCreationForm, UserProfileForm
-from .utils import validate_phone_number, validate_postal_code, get_user_statistics
+from .utils import (
+    validate_phone_number, validate_postal_code, get_user_statistics,
+    create_missing_user_profiles, assign_existing_users_to_member_group,
+    get_member_group_and_role,
+)
 
 
 class UserProfileModelTest(TestCase):
     """Test cases for the UserProfile model."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
             first_name='Test',
             last_name='User'
         )
-        self.profile = self.user.profile
+        cls.profile = UserProfile.objects.create(user=cls.user)
     
     def test_profile_creation(self):
-        """Test that profile is automatically created when user is created."""
+        """Test that the profile is reachable from its user."""
         self.assertIsInstance(self.user.profile, UserProfile)
         self.assertEqual(self.user.profile.user, self.user)
     
     def test_profile_string_representation(self):
         """Test profile string representation."""
-        self.assertEqual(str(self.profile), "testuser's Profile")
+        self.assertEqual(str(self.profile), "Test User Profile")
     
     def test_profile_fields(self):
-        """Test that all profile fields are properly set."""
-        self.profile.phone = '+27 12 345 6789'
-        self.profile.date_of_birth = '1990-01-01'
-        self.profile.gender = 'Male'
-        self.profile.address = '123 Test Street'
-        self.profile.city = 'Pretoria'
-        self.profile.province = 'Gauteng'
-        self.profile.postal_code = '0001'
-        self.profile.save()
+        """Test that personal, medical, emergency contact and preference fields are stored."""
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            phone='+27 12 345 6789',
+            date_of_birth='1990-01-01',
+            gender='Male',
+            address='123 Test Street',
+            city='Pretoria',
+            province='Gauteng',
+            postal_code='0001',
+            allergies='Peanuts, Shellfish',
+            medical_conditions='Asthma',
+            current_medications='Inhaler',
+            emergency_contact_name='John Doe',
+            emergency_contact_phone='+27 82 123 4567',
+            emergency_contact_relationship='Spouse',
+            preferred_language='af',
+            timezone='Africa/Johannesburg',
+            email_notifications=False,
+            sms_notifications=True,
+            mfa_enabled=True,
+        )
+        self.profile.refresh_from_db()
         
+        # Personal information
         self.assertEqual(self.profile.phone, '+27 12 345 6789')
         self.assertEqual(self.profile.date_of_birth.year, 1990)
         self.assertEqual(self.profile.gender, 'Male')
@@ -49,38 +68,18 @@ class UserProfileModelTest(TestCase):
         self.assertEqual(self.profile.city, 'Pretoria')
         self.assertEqual(self.profile.province, 'Gauteng')
         self.assertEqual(self.profile.postal_code, '0001')
-    
-    def test_medical_information(self):
-        """Test medical information fields."""
-        self.profile.allergies = 'Peanuts, Shellfish'
-        self.profile.medical_conditions = 'Asthma'
-        self.profile.current_medications = 'Inhaler'
-        self.profile.save()
         
+        # Medical information
         self.assertEqual(self.profile.allergies, 'Peanuts, Shellfish')
         self.assertEqual(self.profile.medical_conditions, 'Asthma')
         self.assertEqual(self.profile.current_medications, 'Inhaler')
-    
-    def test_emergency_contact(self):
-        """Test emergency contact fields."""
-        self.profile.emergency_contact_name = 'John Doe'
-        self.profile.emergency_contact_phone = '+27 82 123 4567'
-        self.profile.emergency_contact_relationship = 'Spouse'
-        self.profile.save()
         
+        # Emergency contact
         self.assertEqual(self.profile.emergency_contact_name, 'John Doe')
         self.assertEqual(self.profile.emergency_contact_phone, '+27 82 123 4567')
         self.assertEqual(self.profile.emergency_contact_relationship, 'Spouse')
-    
-    def test_user_preferences(self):
-        """Test user preference fields."""
-        self.profile.preferred_language = 'af'
-        self.profile.timezone = 'Africa/Johannesburg'
-        self.profile.email_notifications = False
-        self.profile.sms_notifications = True
-        self.profile.mfa_enabled = True
-        self.profile.save()
         
+        # Preferences
         self.assertEqual(self.profile.preferred_language, 'af')
         self.assertEqual(self.profile.timezone, 'Africa/Johannesburg')
         self.assertFalse(self.profile.email_notifications)
@@ -103,6 +102,12 @@ class UserProfileModelTest(TestCase):
         self.profile.save()
         expected_address = 'Pretoria, Gauteng, 0001'
         self.assertEqual(self.profile.get_full_address(), expected_address)
+        
+        # Test with no address at all
+        self.profile.city = ''
+        self.profile.province = ''
+        self.profile.postal_code = ''
+        self.assertEqual(self.profile.get_full_address(), '')
 
 
 class UserGroupTest(TestCase):
@@ -169,18 +174,19 @@ class UserRoleTest(TestCase):
 class UserGroupMembershipTest(TestCase):
     """Test cases for the UserGroupMembership model."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.group = UserGroup.objects.create(
+        cls.group = UserGroup.objects.create(
             name='Test Group',
             description='A test group'
         )
-        self.role = UserRole.objects.create(
+        cls.role = UserRole.objects.create(
             name='Test Role',
             description='A test role',
             permissions={}
@@ -188,11 +194,12 @@ class UserGroupMembershipTest(TestCase):
     
     def test_create_membership(self):
         """Test creating a group membership."""
-        membership = UserGroupMembership.objects.create(
-            user=self.user,
-            group=self.group,
-            role=self.role
-        )
+        with self.assertNumQueries(1):
+            membership = UserGroupMembership.objects.create(
+                user=self.user,
+                group=self.group,
+                role=self.role
+            )
         self.assertEqual(membership.user, self.user)
         self.assertEqual(membership.group, self.group)
         self.assertEqual(membership.role, self.role)
@@ -223,6 +230,21 @@ class UserGroupMembershipTest(TestCase):
         )
         expected = f"{self.user.username} - {self.group.name} ({self.role.name})"
         self.assertEqual(str(membership), expected)
+        
+        # The default manager joins user, group and role
+        membership = UserGroupMembership.objects.get(pk=membership.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(membership), expected)
+    
+    def test_membership_listing_query_count(self):
+        """Test listing memberships doesn't issue a query per row."""
+        for i in range(3):
+            group = UserGroup.objects.create(name=f'Group {i}')
+            UserGroupMembership.objects.create(user=self.user, group=group, role=self.role)
+        
+        with self.assertNumQueries(1):
+            labels = [str(membership) for membership in UserGroupMembership.objects.all()]
+        self.assertEqual(len(labels), 3)
 
 
 class FormTest(TestCase):
@@ -290,87 +312,109 @@ class UtilityFunctionTest(TestCase):
     
     def test_get_user_statistics(self):
         """Test user statistics function."""
-        # Create some test data
-        user1 = User.objects.create_user(
-            username='user1',
-            email='user1@example.com',
-            password='pass1'
-        )
-        user2 = User.objects.create_user(
-            username='user2',
-            email='user2@example.com',
-            password='pass2'
-        )
-        
-        # Update profiles
-        user1.profile.city = 'Pretoria'
-        user1.profile.preferred_language = 'en'
-        user1.profile.save()
-        
-        user2.profile.city = 'Cape Town'
-        user2.profile.preferred_language = 'af'
-        user2.profile.save()
-        
-        stats = get_user_statistics()
+        # Create some test data; the statistics never authenticate, so skip
+        # create_user() and its password hashing
+        user1, user2 = User.objects.bulk_create([
+            User(username='user1', email='user1@example.com'),
+            User(username='user2', email='user2@example.com'),
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user1, city='Pretoria', preferred_language='en'),
+            UserProfile(user=user2, city='Cape Town', preferred_language='af'),
+        ])
+        group = UserGroup.objects.create(name='Choir')
+        role = UserRole.objects.create(name='Member', permissions={})
+        UserGroupMembership.objects.bulk_create([
+            UserGroupMembership(user=user1, group=group, role=role),
+            UserGroupMembership(user=user2, group=group, role=role, is_active=False),
+        ])
+        
+        # User counts, profile completion, languages, cities and group
+        # membership: one aggregate query each, however many rows exist
+        with self.assertNumQueries(5):
+            stats = get_user_statistics()
         self.assertEqual(stats['total_users'], 2)
         self.assertEqual(stats['active_users'], 2)
         self.assertEqual(stats['language_distribution']['en'], 1)
         self.assertEqual(stats['language_distribution']['af'], 1)
         self.assertEqual(stats['city_distribution']['Pretoria'], 1)
         self.assertEqual(stats['city_distribution']['Cape Town'], 1)
+        self.assertEqual(stats['group_membership'], {'Choir': 1})
+    
+    def test_create_missing_user_profiles(self):
+        """Test profiles are backfilled for users without one."""
+        User.objects.bulk_create([
+            User(username=f'imported{i}', email=f'imported{i}@example.com')
+            for i in range(3)
+        ])
+        missing = User.objects.filter(profile__isnull=True).count()
+        
+        self.assertEqual(create_missing_user_profiles(batch_size=2), missing)
+        self.assertFalse(User.objects.filter(profile__isnull=True).exists())
+        self.assertEqual(create_missing_user_profiles(), 0)
+    
+    def test_assign_existing_users_to_member_group(self):
+        """Test existing users without a Member membership are bulk-assigned."""
+        users = User.objects.bulk_create([
+            User(username=f'existing{i}', email=f'existing{i}@example.com')
+            for i in range(3)
+        ])
+        member_group, member_role = get_member_group_and_role()
+        UserGroupMembership.objects.create(user=users[0], group=member_group, role=member_role)
+        
+        self.assertEqual(assign_existing_users_to_member_group(batch_size=1), 2)
+        self.assertEqual(
+            UserGroupMembership.objects.filter(
+                group=member_group, role=member_role, is_active=True
+            ).count(),
+            3
+        )
+        self.assertEqual(assign_existing_users_to_member_group(), 0)
 
 
 class AdminTest(TestCase):
     """Test cases for admin interface."""
     
-    def setUp(self):
-        """Set up test data."""
-        self.admin_user = User.objects.create_superuser(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.admin_user = User.objects.create_superuser(
             username='admin',
             email='admin@example.com',
             password='adminpass123'
         )
-        self.client = Client()
-        self.client.login(username='admin', password='adminpass123')
-    
-    def test_admin_access(self):
-        """Test that admin users can access the admin interface."""
-        response = self.client.get('/admin/')
-        self.assertEqual(response.status_code, 200)
-    
-    def test_user_admin(self):
-        """Test user admin interface."""
-        response = self.client.get('/admin/auth/user/')
-        self.assertEqual(response.status_code, 200)
-    
-    def test_user_profile_admin(self):
-        """Test user profile admin interface."""
-        response = self.client.get('/admin/home/userprofile/')
-        self.assertEqual(response.status_code, 200)
-    
-    def test_user_group_admin(self):
-        """Test user group admin interface."""
-        response = self.client.get('/admin/home/usergroup/')
-        self.assertEqual(response.status_code, 200)
-    
-    def test_user_role_admin(self):
-        """Test user role admin interface."""
-        response = self.client.get('/admin/home/userrole/')
-        self.assertEqual(response.status_code, 200)
+    
+    def setUp(self):
+        """Log the admin in on this test's client."""
+        self.client.force_login(self.admin_user)
+    
+    def test_admin_pages(self):
+        """Test that admin users can access the admin index and model listings."""
+        for url in (
+            '/admin/',
+            '/admin/auth/user/',
+            '/admin/home/userprofile/',
+            '/admin/home/usergroup/',
+            '/admin/home/userrole/',
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
 
 
 class UserRequirementsTest(TestCase):
     """Test that all user requirements are met."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
         # Create default groups and roles
         from .utils import create_default_groups_and_roles
-        self.default_data = create_default_groups_and_roles()
+        cls.default_data = create_default_groups_and_roles()
         
         # Get the Member group and Member role
-        self.member_group = UserGroup.objects.get(name='Member')
-        self.member_role = UserRole.objects.get(name='Member')
+        cls.member_group = UserGroup.objects.get(name='Member')
+        cls.member_role = UserRole.objects.get(name='Member')
     
     def test_requirement_1_user_profile_creation(self):
         """Test that every user that registers must have a profile."""
@@ -398,8 +442,8 @@ class UserRequirementsTest(TestCase):
         )
         
         # Create additional groups
-        youth_group = UserGroup.objects.get(name='Youth')
-        choir_group = UserGroup.objects.get(name='Choir')
+        youth_group = UserGroup.objects.get(name='Youth Leaders')
+        worship_group = UserGroup.objects.get(name='Worship Team')
         
         # Assign user to multiple groups with different roles
         membership1 = UserGroupMembership.objects.create(
@@ -418,14 +462,18 @@ class UserRequirementsTest(TestCase):
         
         membership3 = UserGroupMembership.objects.create(
             user=user,
-            group=choir_group,
+            group=worship_group,
             role=self.member_role,
             is_active=True
         )
         
-        # Verify user has multiple memberships
-        user_memberships = user.group_memberships.filter(is_active=True)
-        self.assertEqual(user_memberships.count(), 3)
+        # Verify user has multiple memberships, fetched with their groups
+        # and roles in a single query
+        with self.assertNumQueries(1):
+            user_memberships = list(
+                UserGroupMembership.objects.filter(user=user, is_active=True)
+            )
+        self.assertEqual(len(user_memberships), 3)
         
         # Verify each membership has a role
         for membership in user_memberships:
@@ -442,17 +490,12 @@ class UserRequirementsTest(TestCase):
         )
         
         # Check that user was automatically assigned to Member group
-        member_membership = UserGroupMembership.objects.filter(
+        self.assertTrue(UserGroupMembership.objects.filter(
             user=user,
             group=self.member_group,
             role=self.member_role,
             is_active=True
-        ).first()
-        
-        self.assertIsNotNone(member_membership)
-        self.assertEqual(member_membership.group.name, 'Member')
-        self.assertEqual(member_membership.role.name, 'Member')
-        self.assertTrue(member_membership.is_active)
+        ).exists())
     
     def test_existing_users_assigned_to_member_group(self):
         """Test that existing users can be assigned to Member group."""
@@ -473,16 +516,12 @@ class UserRequirementsTest(TestCase):
         self.assertTrue(result)
         
         # Verify membership was created
-        membership = UserGroupMembership.objects.filter(
+        self.assertTrue(UserGroupMembership.objects.filter(
             user=user,
             group=self.member_group,
             role=self.member_role,
             is_active=True
-        ).first()
-        
-        self.assertIsNotNone(membership)
-        self.assertEqual(membership.group.name, 'Member')
-        self.assertEqual(membership.role.name, 'Member')
+        ).exists())
     
     def test_unique_group_membership_constraint(self):
         """Test that a user can only have one active membership per group."""
@@ -1,11 +1,17 @@
+import logging
 import re
 from typing import List, Dict, Any
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import transaction
+from django.db.models import Count, Q
 from .models import UserProfile, UserGroup, UserRole, UserGroupMembership
 
+logger = logging.getLogger(__name__)
+
+PHONE_STRIP_RE = re.compile(r'[^\d+]')
+
 
 def validate_phone_number(phone: str) -> bool:
     """
@@ -16,7 +22,7 @@ def validate_phone_number(phone: str) -> bool:
         return True
     
     # Remove all non-digit characters except +
-    cleaned = re.sub(r'[^\d+]', '', phone)
+    cleaned = PHONE_STRIP_RE.sub('', phone)
     
     # Check if it starts with + (international) or is a local number
     if cleaned.startswith('+'):
@@ -48,44 +54,55 @@ def get_user_statistics() -> Dict[str, Any]:
     """
     Get comprehensive user statistics for the community.
     """
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
+    user_counts = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    total_users = user_counts['total']
+    active_users = user_counts['active']
     
     # Get users with profiles
-    users_with_profiles = UserProfile.objects.filter(user__is_active=True).count()
-    users_with_medical_info = UserProfile.objects.filter(
-        user__is_active=True
-    ).exclude(
-        allergies='',
-        medical_conditions='',
-        current_medications=''
-    ).count()
-    
-    users_with_emergency_contact = UserProfile.objects.filter(
-        user__is_active=True
-    ).exclude(
-        emergency_contact_name='',
-        emergency_contact_phone=''
-    ).count()
+    profile_counts = UserProfile.objects.filter(user__is_active=True).aggregate(
+        with_profiles=Count('id'),
+        with_medical_info=Count('id', filter=~Q(
+            allergies='',
+            medical_conditions='',
+            current_medications=''
+        )),
+        with_emergency_contact=Count('id', filter=~Q(
+            emergency_contact_name='',
+            emergency_contact_phone=''
+        )),
+    )
+    users_with_profiles = profile_counts['with_profiles']
+    users_with_medical_info = profile_counts['with_medical_info']
+    users_with_emergency_contact = profile_counts['with_emergency_contact']
     
     # Language distribution
-    language_stats = {}
-    for profile in UserProfile.objects.filter(user__is_active=True):
-        lang = profile.preferred_language
-        language_stats[lang] = language_stats.get(lang, 0) + 1
+    language_stats = dict(
+        UserProfile.objects.filter(user__is_active=True)
+        .values_list('preferred_language')
+        .annotate(Count('id'))
+        .order_by()
+    )
     
     # City distribution
-    city_stats = {}
-    for profile in UserProfile.objects.filter(user__is_active=True).exclude(city=''):
-        city = profile.city
-        if city:
-            city_stats[city] = city_stats.get(city, 0) + 1
+    city_stats = dict(
+        UserProfile.objects.filter(user__is_active=True)
+        .exclude(city='')
+        .values_list('city')
+        .annotate(Count('id'))
+        .order_by()
+    )
     
     # Group membership stats
-    group_stats = {}
-    for group in UserGroup.objects.filter(is_active=True):
-        member_count = group.members.filter(is_active=True).count()
-        group_stats[group.name] = member_count
+    group_stats = dict(
+        UserGroup.objects.annotate(member_count=Count(
+            'usergroupmembership',
+            filter=Q(usergroupmembership__is_active=True)
+        ))
+        .values_list('name', 'member_count')
+    )
     
     return {
         'total_users': total_users,
@@ -238,12 +255,11 @@ def create_default_groups_and_roles():
             defaults={
                 'description': role_data['description'],
                 'permissions': role_data['permissions'],
-                'is_active': True
             }
         )
         created_roles[role_name] = role
         if created:
-            print(f"Created role: {role_name}")
+            logger.info("Created role: %s", role_name)
     
     # Create groups
     for group_name, group_data in groups.items():
@@ -251,12 +267,11 @@ def create_default_groups_and_roles():
             name=group_name,
             defaults={
                 'description': group_data['description'],
-                'is_active': True
             }
         )
         created_groups[group_name] = group
         if created:
-            print(f"Created group: {group_name}")
+            logger.info("Created group: %s", group_name)
     
     return {
         'roles': created_roles,
@@ -264,34 +279,39 @@ def create_default_groups_and_roles():
     }
 
 
+def get_member_group_and_role():
+    """
+    Get or create the default Member group and Member role.
+    """
+    member_group, created = UserGroup.objects.get_or_create(
+        name='Member',
+        defaults={
+            'description': _('Default group for all registered community members'),
+        }
+    )
+    
+    member_role, created = UserRole.objects.get_or_create(
+        name='Member',
+        defaults={
+            'description': _('Basic member permissions and access'),
+            'permissions': {
+                'can_view_community': True,
+                'can_edit_profile': True,
+                'can_view_members': True
+            },
+        }
+    )
+    
+    return member_group, member_role
+
+
 def assign_user_to_default_group(user: User):
     """
     Automatically assign a new user to the default Member group with Member role.
     This should be called after a user profile is created.
     """
     try:
-        # Get or create the Member group
-        member_group, created = UserGroup.objects.get_or_create(
-            name='Member',
-            defaults={
-                'description': _('Default group for all registered community members'),
-                'is_active': True
-            }
-        )
-        
-        # Get or create the Member role
-        member_role, created = UserRole.objects.get_or_create(
-            name='Member',
-            defaults={
-                'description': _('Basic member permissions and access'),
-                'permissions': {
-                    'can_view_community': True,
-                    'can_edit_profile': True,
-                    'can_view_members': True
-                },
-                'is_active': True
-            }
-        )
+        member_group, member_role = get_member_group_and_role()
         
         # Create the membership
         membership, created = UserGroupMembership.objects.get_or_create(
@@ -300,77 +320,87 @@ def assign_user_to_default_group(user: User):
             defaults={
                 'role': member_role,
                 'is_active': True,
-                'notes': _('Automatically assigned during registration')
             }
         )
         
         if created:
-            print(f"Assigned user {user.username} to Member group with Member role")
+            logger.info("Assigned user %s to Member group with Member role", user.username)
         else:
-            print(f"User {user.username} already has membership in Member group")
+            logger.info("User %s already has membership in Member group", user.username)
         
         return membership
         
     except Exception as e:
-        print(f"Error assigning user {user.username} to default group: {e}")
+        logger.error("Error assigning user %s to default group: %s", user.username, e)
         return None
 
 
-def assign_existing_users_to_member_group():
+def assign_existing_users_to_member_group(batch_size: int = 1000):
     """
     Assign all existing users to the Member group if they don't already have a membership.
     This is useful for migrating existing users to the new system.
     """
     try:
-        # Get or create the Member group and role
-        member_group, created = UserGroup.objects.get_or_create(
-            name='Member',
-            defaults={
-                'description': _('Default group for all registered community members'),
-                'is_active': True
-            }
-        )
-        
-        member_role, created = UserRole.objects.get_or_create(
-            name='Member',
-            defaults={
-                'description': _('Basic member permissions and access'),
-                'permissions': {
-                    'can_view_community': True,
-                    'can_edit_profile': True,
-                    'can_view_members': True
-                },
-                'is_active': True
-            }
-        )
-        
-        # Get all users who don't have a membership in the Member group
-        users_without_membership = User.objects.filter(
-            ~models.Q(group_memberships__group=member_group)
-        )
-        
-        assigned_count = 0
-        for user in users_without_membership:
-            membership, created = UserGroupMembership.objects.get_or_create(
-                user=user,
-                group=member_group,
-                defaults={
-                    'role': member_role,
-                    'is_active': True,
-                    'notes': _('Automatically assigned during migration')
-                }
+        with transaction.atomic():
+            member_group, member_role = get_member_group_and_role()
+            
+            # Diff against the existing members once instead of a
+            # get_or_create round trip per user
+            existing_user_ids = set(
+                UserGroupMembership.objects.filter(group=member_group)
+                .values_list('user_id', flat=True)
             )
-            if created:
-                assigned_count += 1
+            new_memberships = [
+                UserGroupMembership(
+                    user_id=user_id,
+                    group=member_group,
+                    role=member_role,
+                    is_active=True
+                )
+                for user_id in User.objects.values_list('id', flat=True).iterator()
+                if user_id not in existing_user_ids
+            ]
+            # No ignore_conflicts: the diff above already excludes existing
+            # members, so every row is inserted and the count below is exact
+            UserGroupMembership.objects.bulk_create(new_memberships, batch_size=batch_size)
         
-        print(f"Assigned {assigned_count} existing users to Member group")
+        assigned_count = len(new_memberships)
+        logger.info("Assigned %s existing users to Member group", assigned_count)
         return assigned_count
         
     except Exception as e:
-        print(f"Error assigning existing users to Member group: {e}")
+        logger.error("Error assigning existing users to Member group: %s", e)
         return 0
 
 
+def create_missing_user_profiles(batch_size: int = 1000) -> int:
+    """
+    Create a UserProfile for every user that doesn't have one yet.
+    Useful for backfilling users created before profiles existed or imported
+    with User.objects.bulk_create, which skips save() and post_save.
+    """
+    created_count = 0
+    last_id = 0
+    while True:
+        # Fetch each batch of ids in full before writing, so no cursor over
+        # auth_user is left open while bulk_create inserts (unsafe on SQLite)
+        user_ids = list(
+            User.objects.filter(profile__isnull=True, id__gt=last_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not user_ids:
+            break
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True
+        )
+        created_count += len(user_ids)
+        last_id = user_ids[-1]
+    
+    return created_count
+
+
 def export_user_data(user: User, format: str = 'json') -> Dict[str, Any]:
     """
     Export user data in a structured format.
@@ -395,7 +425,7 @@ def export_user_data(user: User, format: str = 'json') -> Dict[str, Any]:
                 'joined_at': membership.joined_at.isoformat(),
                 'is_active': membership.is_active,
             }
-            for membership in user.group_memberships.filter(is_active=True)
+            for membership in UserGroupMembership.objects.filter(user=user, is_active=True)
         ],
         'metadata': {
             'created_at': user.date_joined.isoformat(),
@@ -460,7 +490,7 @@ def anonymize_user_data(user: User) -> Dict[str, Any]:
                 'role': membership.role.name,
                 'joined_at': membership.joined_at.isoformat(),
             }
-            for membership in user.group_memberships.filter(is_active=True)
+            for membership in UserGroupMembership.objects.filter(user=user, is_active=True)
         ],
         'metadata': {
             'created_at': user.date_joined.isoformat(),
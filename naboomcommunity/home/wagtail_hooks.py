@@ -1,5 +1,6 @@
 from wagtail import hooks
 from wagtail.admin.viewsets.model import ModelViewSet
+from wagtail.admin.views.generic import IndexView
 from wagtail.admin.viewsets import ViewSetGroup
 from wagtail.admin.panels import FieldPanel, MultiFieldPanel, TabbedInterface, ObjectList
 from django.utils.translation import gettext_lazy as _
@@ -61,8 +62,18 @@ def register_language_switcher():
         path('language-switch/', LanguageSwitchView.as_view(), name='set_language'),
     ]
 
+class UserProfileIndexView(IndexView):
+    def get_base_queryset(self):
+        # The listing shows the user and a few short columns; join the user
+        # for its label and leave the address and medical text unloaded
+        return super().get_base_queryset().select_related("user").defer(
+            "address", "allergies", "medical_conditions", "current_medications"
+        )
+
+
 class UserProfileViewSet(ModelViewSet):
     model = UserProfile
+    index_view_class = UserProfileIndexView
     menu_label = _("User Profiles")
     icon = "user"
     list_display = ("user", "phone", "city", "province", "preferred_language", "created_at")
@@ -36,7 +36,10 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', '127.0.0.1'),
         'PORT': os.getenv('DB_PORT', '5432'),
-        # Enhanced connection pooling for production emergency response system
+        # Enhanced connection pooling for production emergency response system.
+        # While the psycopg pool below is disabled, keep connections open
+        # across requests instead of reconnecting (TCP + TLS + auth) each time.
+        'CONN_MAX_AGE': 600,  # 10 minutes
         'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'sslmode': 'require',  # Require SSL in production
@@ -318,10 +321,6 @@ CHANNEL_LAYERS = {
 # HTTP/3 SPECIFIC OPTIMIZATIONS
 # ============================================================================
 
-# HTTP/3 connection optimizations
-CONN_MAX_AGE = 600  # 10 minutes
-CONN_HEALTH_CHECKS = True
-
 # Template optimizations for HTTP/3
 TEMPLATES[0]['APP_DIRS'] = False  # Disable APP_DIRS when using custom loaders
 TEMPLATES[0]['OPTIONS']['loaders'] = [
@@ -160,6 +160,7 @@ class UserProfileAPIViewSet(BaseAPIViewSet):
             'emergency_contact_phone', 'emergency_contact_relationship'
         ]
         
+        active_groups = [membership.group.name for membership in group_memberships]
         completed_fields = sum(1 for field in profile_fields if getattr(profile, field))
         total_fields = len(profile_fields)
         completion_percentage = (completed_fields / total_fields) * 100
@@ -168,8 +169,8 @@ class UserProfileAPIViewSet(BaseAPIViewSet):
             'profile_completion_percentage': round(completion_percentage, 2),
             'completed_fields': completed_fields,
             'total_fields': total_fields,
-            'group_memberships_count': group_memberships.count(),
-            'active_groups': [membership.group.name for membership in group_memberships],
+            'group_memberships_count': len(active_groups),
+            'active_groups': active_groups,
             'profile_created_at': profile.created_at,
             'profile_updated_at': profile.updated_at,
             'user_joined_at': user.date_joined,